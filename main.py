@@ -4,14 +4,19 @@ Main entry point for Adobe Hackathon Round 1A - PDF Outline Extractor
 Processes all PDFs from /app/input and generates JSON outputs in /app/output
 """
 
-import json
+import os
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Tuple
 
-# Import the PDF outline extractor
-from src.pdf_outline_extractor.extractor_new import PDFOutlineExtractor
+# Import the shared JSON writer; the PDF outline extractor (and PyMuPDF with
+# it) is only imported once there are PDFs to process
+from src.pdf_outline_extractor.json_writer_new import JSONWriter
+
+if TYPE_CHECKING:
+    from src.pdf_outline_extractor.extractor_new import PDFOutlineExtractor
 
 # Configure logging
 logging.basicConfig(
@@ -20,8 +25,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Extractor parameters shared by the serial path and every worker process
+EXTRACTOR_PARAMS = {
+    "min_h1_size_ratio": 1.5,
+    "min_h2_size_ratio": 1.3,
+    "min_h3_size_ratio": 1.1,
+}
+
+# Per-process extractor, created once by _init_worker
+_worker_extractor = None
+_writer = JSONWriter()
+
 
-def process_pdf_file(pdf_path: Path, output_path: Path, extractor: PDFOutlineExtractor) -> bool:
+def process_pdf_file(pdf_path: Path, output_path: Path, extractor: "PDFOutlineExtractor") -> bool:
     """
     Process a single PDF file and save the outline as JSON.
     
@@ -34,13 +50,13 @@ def process_pdf_file(pdf_path: Path, output_path: Path, extractor: PDFOutlineExt
         True if successful, False otherwise
     """
     try:
-        logger.info(f"Processing: {pdf_path.name}")
+        logger.debug("Processing: %s", pdf_path.name)
         
         # Extract outline from PDF
-        result = extractor.extract_outline(str(pdf_path))
+        result = extractor.extract_outline(os.fspath(pdf_path))
         
         if not result:
-            logger.warning(f"No outline extracted from {pdf_path.name}")
+            logger.warning("No outline extracted from %s", pdf_path.name)
             # Create empty result structure
             result = {
                 "title": "",
@@ -48,14 +64,13 @@ def process_pdf_file(pdf_path: Path, output_path: Path, extractor: PDFOutlineExt
             }
         
         # Save as JSON
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        _writer.write(result, output_path)
         
-        logger.info(f"Successfully processed {pdf_path.name} -> {output_path.name}")
+        logger.debug("Successfully processed %s -> %s", pdf_path.name, output_path.name)
         return True
         
     except Exception as e:
-        logger.error(f"Error processing {pdf_path.name}: {str(e)}")
+        logger.error("Error processing %s: %s", pdf_path.name, e)
         # Create error result
         error_result = {
             "title": "",
@@ -63,13 +78,26 @@ def process_pdf_file(pdf_path: Path, output_path: Path, extractor: PDFOutlineExt
             "error": str(e)
         }
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(error_result, f, indent=2, ensure_ascii=False)
+            _writer.write(error_result, output_path)
         except:
             pass
         return False
 
 
+def _init_worker(extractor_params: Dict[str, Any]) -> None:
+    """Create one PDFOutlineExtractor per worker process."""
+    from src.pdf_outline_extractor.extractor_new import PDFOutlineExtractor
+    
+    global _worker_extractor
+    _worker_extractor = PDFOutlineExtractor(**extractor_params)
+
+
+def _process_pdf_worker(paths: Tuple[str, str]) -> bool:
+    """Process one (pdf_path, output_path) pair inside a worker process."""
+    pdf_path, output_path = paths
+    return process_pdf_file(Path(pdf_path), Path(output_path), _worker_extractor)
+
+
 def main():
     """
     Main function that processes all PDFs from /app/input directory
@@ -79,53 +107,61 @@ def main():
     output_dir = Path("/app/output")
     
     logger.info("Starting PDF Outline Extractor for Adobe Hackathon Round 1A")
-    logger.info(f"Input directory: {input_dir}")
-    logger.info(f"Output directory: {output_dir}")
+    logger.info("Input directory: %s", input_dir)
+    logger.info("Output directory: %s", output_dir)
     
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Check if input directory exists
     if not input_dir.exists():
-        logger.error(f"Input directory {input_dir} does not exist")
+        logger.error("Input directory %s does not exist", input_dir)
         sys.exit(1)
     
-    # Find all PDF files in input directory
-    pdf_files = list(input_dir.glob("*.pdf"))
+    # Find all PDF files in input directory, in name order so batches are
+    # processed and written in a deterministic, directory-friendly order
+    with os.scandir(input_dir) as entries:
+        pdf_files = [Path(path) for path in sorted(entry.path for entry in entries
+                                                   if entry.name.endswith('.pdf') and entry.is_file())]
     
     if not pdf_files:
         logger.warning("No PDF files found in input directory")
         sys.exit(0)
     
-    logger.info(f"Found {len(pdf_files)} PDF file(s) to process")
+    logger.info("Found %d PDF file(s) to process", len(pdf_files))
     
-    # Initialize the extractor with optimized parameters
-    extractor = PDFOutlineExtractor(
-        min_h1_size_ratio=1.5,
-        min_h2_size_ratio=1.3,
-        min_h3_size_ratio=1.1
-    )
+    # Loaded in the parent so forked workers inherit the imported modules
+    from src.pdf_outline_extractor.extractor_new import PDFOutlineExtractor
     
-    # Process each PDF file
-    successful = 0
-    failed = 0
+    # Generate corresponding JSON output filename for each PDF
+    jobs = [(pdf_path, output_dir / (pdf_path.stem + ".json")) for pdf_path in pdf_files]
     
-    for pdf_path in pdf_files:
-        # Generate corresponding JSON output filename
-        json_filename = pdf_path.stem + ".json"
-        output_path = output_dir / json_filename
-        
-        # Process the PDF
-        if process_pdf_file(pdf_path, output_path, extractor):
-            successful += 1
-        else:
-            failed += 1
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    
+    if max_workers > 1:
+        # Documents are independent and extraction is CPU-bound, so fan out
+        # across processes; each worker builds its extractor once.
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(EXTRACTOR_PARAMS,)) as executor:
+            results = list(executor.map(
+                _process_pdf_worker,
+                [(os.fspath(pdf_path), os.fspath(output_path)) for pdf_path, output_path in jobs]
+            ))
+    else:
+        # Single file or single CPU: skip the process pool start-up cost
+        extractor = PDFOutlineExtractor(**EXTRACTOR_PARAMS)
+        results = [process_pdf_file(pdf_path, output_path, extractor)
+                   for pdf_path, output_path in jobs]
+    
+    successful = sum(results)
+    failed = len(results) - successful
     
     # Summary
-    logger.info(f"Processing complete: {successful} successful, {failed} failed")
+    logger.info("Processing complete: %d successful, %d failed", successful, failed)
     
     if failed > 0:
-        logger.warning(f"{failed} files failed to process")
+        logger.warning("%d files failed to process", failed)
         sys.exit(1)
     else:
         logger.info("All files processed successfully")
@@ -8,8 +8,19 @@ __version__ = "1.0.0"
 __author__ = "Adobe Hackathon Team"
 __email__ = "team@example.com"
 
-from .extractor_new import PDFOutlineExtractor
-
 __all__ = [
     "PDFOutlineExtractor",
+    "JSONWriter",
 ]
+
+
+def __getattr__(name):
+    """Import public classes on first access, so importing a submodule such as
+    cli_hackathon does not load PyMuPDF up front."""
+    if name == "PDFOutlineExtractor":
+        from .extractor_new import PDFOutlineExtractor
+        return PDFOutlineExtractor
+    if name == "JSONWriter":
+        from .json_writer_new import JSONWriter
+        return JSONWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,17 +4,136 @@ Adobe Hackathon CLI - Process PDFs from input directory to output directory.
 Expected Docker usage: process PDFs from /app/input to /app/output
 """
 
+import argparse
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from .extractor_new import PDFOutlineExtractor
+from typing import List, Optional, Tuple
+from .json_writer_new import JSONWriter
 
+# Per-process extractor and writer, created once by _init_worker
+_extractor = None
+_writer = None
 
-def main():
+# Option defaults, shared by the parser and the no-argument fast path
+_DEFAULT_ARGS = {
+    "skip_unchanged": False,
+    "workers": None,
+    "compact": False,
+}
+
+
+def _init_worker(pretty: bool = True):
+    """Create one PDFOutlineExtractor and JSONWriter per worker process."""
+    # Imported here so PyMuPDF is only loaded once there is work to do
+    from .extractor_new import PDFOutlineExtractor
+    
+    global _extractor, _writer
+    _extractor = PDFOutlineExtractor()
+    _writer = JSONWriter(pretty=pretty)
+
+
+def _process_one(pdf_path: str, output_dir: str) -> Tuple[str, Optional[str]]:
+    """
+    Extract one PDF and save its outline as JSON.
+    
+    Returns:
+        (output filename, error message or None)
+    """
+    # Plain string path handling; no Path objects needed per file
+    output_name = os.path.splitext(os.path.basename(pdf_path))[0] + ".json"
+    output_file = os.path.join(output_dir, output_name)
+    try:
+        # Extract outline
+        result = _extractor.extract_outline(pdf_path)
+        
+        # Save result with same filename but .json extension
+        _writer.write(result, output_file)
+        
+        return output_name, None
+    except Exception as e:
+        return output_name, str(e)
+
+
+def _list_pdfs(input_dir: Path) -> List[Path]:
+    """List *.pdf files in input_dir, sorted by name, with one scandir pass."""
+    with os.scandir(input_dir) as entries:
+        return [Path(path) for path in sorted(entry.path for entry in entries
+                                              if entry.name.endswith('.pdf') and entry.is_file())]
+
+
+def _is_up_to_date(pdf_file: Path, output_dir: Path) -> bool:
+    """True if the PDF's JSON output exists, is at least as new as the PDF, and is not empty."""
+    output_file = output_dir / f"{pdf_file.stem}.json"
+    try:
+        if output_file.stat().st_mtime < pdf_file.stat().st_mtime:
+            return False
+        result = json.loads(output_file.read_bytes())
+    except (OSError, ValueError):
+        return False
+    
+    # extract_outline reports failures as an empty title and outline, so
+    # such outputs are retried rather than trusted
+    return isinstance(result, dict) and bool(result.get("title") or result.get("outline"))
+
+
+def _report(pdf_name: str, output_name: Optional[str], error: Optional[str]):
+    """Print the per-file result line."""
+    if error is None:
+        print(f"✅ Saved {output_name}")
+    else:
+        # Other files are still processed rather than failing completely
+        print(f"❌ Error processing {pdf_name}: {error}")
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the optional command-line flags."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--skip-unchanged", action="store_true",
+        help="skip PDFs whose JSON output is already newer than the PDF "
+             "(empty outputs, as left by failed extractions, are always redone)"
+    )
+    parser.add_argument(
+        "--workers", type=_positive_int,
+        help="number of worker processes (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="write compact JSON instead of 2-space indented output"
+    )
+    parser.set_defaults(**_DEFAULT_ARGS)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
     """
     Process all PDF files from /app/input directory and save results to /app/output directory.
     This is the expected behavior for Adobe Hackathon Docker container.
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # The container runs without arguments, so only build the parser when
+    # flags were actually given
+    if argv:
+        args = _build_parser().parse_args(argv)
+    else:
+        args = argparse.Namespace(**_DEFAULT_ARGS)
+    
     input_dir = Path("/app/input")
     output_dir = Path("/app/output")
     
@@ -26,7 +145,7 @@ def main():
         sys.exit(1)
     
     # Find all PDF files in input directory
-    pdf_files = list(input_dir.glob("*.pdf"))
+    pdf_files = _list_pdfs(input_dir)
     
     if not pdf_files:
         print(f"No PDF files found in {input_dir}")
@@ -34,27 +153,45 @@ def main():
     
     print(f"Found {len(pdf_files)} PDF files to process")
     
-    extractor = PDFOutlineExtractor()
+    if args.skip_unchanged:
+        pending = [pdf_file for pdf_file in pdf_files if not _is_up_to_date(pdf_file, output_dir)]
+        if len(pending) < len(pdf_files):
+            print(f"Skipping {len(pdf_files) - len(pending)} unchanged PDF files")
+        pdf_files = pending
+        if not pdf_files:
+            print("Processing complete!")
+            return
     
-    for pdf_file in pdf_files:
-        try:
-            print(f"Processing {pdf_file.name}...")
-            
-            # Extract outline
-            result = extractor.extract_outline(str(pdf_file))
-            
-            # Save result with same filename but .json extension
-            output_file = output_dir / f"{pdf_file.stem}.json"
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=4, ensure_ascii=False)
+    max_workers = min(len(pdf_files), args.workers or os.cpu_count() or 1)
+    output_dir_str = os.fspath(output_dir)
+    
+    if max_workers == 1:
+        # Single file or single worker: skip the process pool start-up cost
+        _init_worker(not args.compact)
+        for pdf_file in pdf_files:
+            pdf_name = pdf_file.name
+            print(f"Processing {pdf_name}...")
+            _report(pdf_name, *_process_one(os.fspath(pdf_file), output_dir_str))
+    else:
+        # Documents are independent, so extract them in parallel and report
+        # each one as it finishes
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(not args.compact,)) as executor:
+            futures = {}
+            for pdf_file in pdf_files:
+                futures[executor.submit(_process_one, os.fspath(pdf_file), output_dir_str)] = pdf_file.name
             
-            print(f"✅ Saved {output_file.name}")
+            # Announce the whole batch with a single write to stdout
+            print("\n".join(f"Processing {pdf_name}..." for pdf_name in futures.values()))
             
-        except Exception as e:
-            print(f"❌ Error processing {pdf_file.name}: {e}")
-            # Continue processing other files rather than failing completely
-            continue
+            for future in as_completed(futures):
+                try:
+                    output_name, error = future.result()
+                except Exception as e:
+                    # A crashed worker breaks the pool (BrokenProcessPool);
+                    # report the affected files instead of aborting the run
+                    output_name, error = None, str(e)
+                _report(futures[future], output_name, error)
     
     print("Processing complete!")
 
@@ -9,10 +9,143 @@ import fitz  # PyMuPDF
 from typing import List, Dict, Any, Optional, Tuple
 import re
 import statistics
+import sys
 from pathlib import Path
 import logging
 import unicodedata
 import json
+from functools import lru_cache
+from itertools import takewhile
+from operator import itemgetter
+
+
+# Text predicates shared by every extractor instance. They are cached because
+# running headers, footers and form labels repeat the same text on many pages.
+
+@lru_cache(maxsize=4096)
+def _is_form_field_text(text: str) -> bool:
+    """Check if text looks like a form field label."""
+    text = text.strip().lower()
+    
+    # Very short text (likely form numbers or labels)
+    if len(text) <= 3 and text.isdigit():
+        return True
+    
+    if len(text) <= 5 and (text.endswith('.') or text.isdigit()):
+        return True
+    
+    # Common form field patterns
+    form_indicators = [
+        'name', 'designation', 'date', 'service', 'pay', 'whether',
+        'home town', 'employed', 'signature', 'place', 'stamp',
+        'office', 'department', 'employee', 'id', 'number', 's.no',
+        'serial', 'amount', 'rupees', 'advance', 'purpose', 'from',
+        'to', 'duration', 'period', 'remarks', 'recommendation',
+        'approved', 'sanctioned', 'certified', 'checked'
+    ]
+    
+    # Check for exact matches or containing form indicators
+    if text in form_indicators:
+        return True
+        
+    # Check if text contains form indicators (but not decorative text or actual titles)
+    for indicator in form_indicators:
+        # More strict matching - avoid false positives with decorative text and document titles
+        if (indicator in text and 
+            len(text) <= 30 and  # Shorter text more likely to be form fields
+            not any(deco in text for deco in ['hope', 'see', 'you', 'there', 'welcome', 'party', 'event']) and
+            not any(title_pattern in text for title_pattern in ['application form', 'request form', 'form for'])):
+            return True
+    
+    # Form field patterns
+    form_patterns = [
+        r'^s\.?\s*no\.?$',  # S.No, S No, etc.
+        r'^\d+\.?$',  # Just numbers
+        r'^[a-z]\)$',  # a), b), c)
+        r'^\([a-z]\)$',  # (a), (b), (c)
+        r'^rs\.?\s*\d*$',  # Rs. or Rs
+        r'^\$\s*\d*$',  # $ amounts
+        r'^date\s*:',  # Date:
+        r'^time\s*:',  # Time:
+    ]
+    
+    for pattern in form_patterns:
+        if re.match(pattern, text, re.IGNORECASE):
+            return True
+            
+    return False
+
+
+@lru_cache(maxsize=4096)
+def _has_title_shape(text: str) -> bool:
+    """Check if stripped text that is not a form field reads like a title."""
+    # Looks like a sentence or paragraph
+    if text.count('.') > 2 or text.count(',') > 3:
+        return False
+        
+    # Good title indicators
+    title_words = ['application', 'form', 'report', 'guide', 'manual', 
+                  'overview', 'introduction', 'plan', 'proposal', 'request']
+    
+    text_lower = text.lower()
+    if any(word in text_lower for word in title_words):
+        return True
+        
+    # Title case or ALL CAPS
+    words = text.split()
+    if len(words) >= 2:
+        title_case_count = sum(1 for word in words if word and word[0].isupper())
+        if title_case_count / len(words) >= 0.5:
+            return True
+            
+    return False
+
+
+@lru_cache(maxsize=4096)
+def _skip_span_verdict(text: str) -> Optional[bool]:
+    """
+    Apply the text rules for skipping obvious non-headings.
+    
+    Returns True or False when a rule decides, or None when only the
+    form field check remains.
+    """
+    text_lower = text.lower()
+    
+    # Don't skip specific target headings
+    target_headings = ['revision history', 'table of contents', 'acknowledgements', 'references', 'pathway options']
+    if any(target in text_lower for target in target_headings):
+        return False
+    
+    # Don't skip critical file03 headings - be flexible with Phase III pattern
+    critical_file03_headings = ['guidance and advice', 'milestones', 'phase iii']
+    if any(critical in text_lower for critical in critical_file03_headings):
+        return False
+    
+    # Skip headers/footers that appear on multiple pages
+    if any(skip in text_lower for skip in [
+        'overview', 'software testing', 'qualifications board', 
+        'foundation level extension', 'copyright', '©', 'international',
+        'version 1.0', 'agile tester'
+    ]) and len(text.split()) <= 6:
+        return True
+    
+    # Skip table of contents entries (with many dots and page numbers)
+    if text.count('.') > 20:  # TOC entries have tons of dots
+        return True
+    
+    # Skip table of contents entries with pattern "Text . Number" (e.g., "Revision History . 3")
+    if re.match(r'.+\s\.\s\d+$', text):
+        return True
+    
+    # Skip table of contents entries with pattern "Text. Number" (e.g., "2.5 Structure and Course Duration. 8")
+    if re.match(r'.+\.\s\d+$', text):
+        return True
+    
+    # Skip author names and long descriptive text
+    if len(text) > 100:
+        return True
+    
+    return None
 
 
 class PDFOutlineExtractor:
@@ -77,6 +210,100 @@ class PDFOutlineExtractor:
             re.compile(r'^Appendix\s+[A-Z]', re.UNICODE | re.IGNORECASE),  # Appendix A
             re.compile(r'^Table\s+of\s+Contents', re.UNICODE | re.IGNORECASE),  # TOC
         ]
+        
+        # Text normalization: runs of 3+ identical characters, and space runs
+        self.repeated_char_pattern = re.compile(r'(.)\1{2,}')
+        self.multi_space_pattern = re.compile(r' +')
+        
+        # Invitation/flyer phrases matched in a single scan of the first page text
+        invitation_indicators = [
+            'hope to see', 'pigeon forge', 'rsvp', 'party', 
+            'invitation', 'please visit', 'waiver', 'topjump'
+        ]
+        self.invitation_pattern = re.compile(
+            '|'.join(map(re.escape, invitation_indicators)), re.UNICODE | re.IGNORECASE
+        )
+        
+        # RFP heading keywords, each level matched in one scan of the lowercased text
+        rfp_h1_keywords = [
+            "ontario", "digital library", "critical component", 
+            "road map", "prosperity", "implementing"
+        ]
+        rfp_h2_keywords = [
+            'summary', 'background', 'methodology', 'deliverables', 
+            'timeline', 'budget', 'evaluation', 'conclusion',
+            'business plan', 'approach', 'awarding', 'contract',
+            'appendix a:', 'appendix b:', 'appendix c:', 'steering committee', 
+            'terms of reference', 'electronic resources', 'envisioned phases',
+            'funding'
+        ]
+        rfp_h3_keywords = [
+            'timeline', 'access', 'governance', 'funding', 'decision-making',
+            'accountability', 'structure', 'equitable', 'shared', 'local',
+            'guidance', 'advice', 'training', 'purchasing', 'licensing', 
+            'technological', 'support', 'milestones', 'business planning', 
+            'implementing', 'transitioning', 'operating', 'growing', 'preamble', 
+            'membership', 'appointment', 'criteria', 'process', 'term', 'chair', 
+            'meetings', 'lines', 'communication', 'financial', 'administrative', 
+            'policies', 'phase', 'what could', 'really mean'
+        ]
+        self.rfp_h1_pattern = re.compile('|'.join(map(re.escape, rfp_h1_keywords)), re.UNICODE)
+        self.rfp_h2_pattern = re.compile('|'.join(map(re.escape, rfp_h2_keywords)), re.UNICODE)
+        self.rfp_h3_pattern = re.compile('|'.join(map(re.escape, rfp_h3_keywords)), re.UNICODE)
+        
+        # Body text and page furniture screens, one alternation per predicate
+        body_patterns = [
+            r'hereby\s+request',
+            r'i\s+am\s+applying',
+            r'please\s+consider',
+            r'the\s+undersigned',
+            r'kindly\s+approve',
+            r'i\s+have\s+the\s+honor',
+            r'details\s+are\s+as\s+follows',
+            r'for\s+your\s+kind\s+consideration',
+            r'awaiting\s+your\s+response',
+            r'thank\s+you',
+            r'yours\s+faithfully',
+            r'yours\s+sincerely',
+            r'with\s+due\s+respect'
+        ]
+        page_element_patterns = [
+            r'^(page\s+)?\d+(\s+of\s+\d+)?$',  # Page numbers
+            r'^\d{4}[-/]\d{2}[-/]\d{2}$',  # Dates
+            r'^page\s+\d+',
+            r'confidential',
+            r'internal\s+use',
+            r'draft',
+            r'©\s*\d{4}',
+            r'all\s+rights\s+reserved'
+        ]
+        # Document type indicator phrases, matched against lowercased span text
+        doc_type_phrases = {
+            'rfp': [
+                'rfp:', 'request for proposal', 'proposal for developing',
+                'business plan', 'ontario digital library', 'steering committee',
+                'timeline:', 'background', 'summary'
+            ],
+            'strong_form': [
+                'application form for', 'employee code', 'employee name:',
+                'ltc advance', 'grant of advance', 'signature of employee',
+                'forwarded for approval', 'office seal'
+            ],
+            'form': ['application', 'form', 'name:', 'date:', 'signature'],
+            'structured': [
+                'chapter', 'section', 'introduction', 'overview', 
+                'table of contents', 'acknowledgements', 'foundation level',
+                'revision history', 'copyright notice'
+            ],
+            'manual': ['foundation', 'extensions', 'level'],
+        }
+        self.doc_type_patterns = {
+            name: re.compile('|'.join(map(re.escape, phrases)), re.UNICODE)
+            for name, phrases in doc_type_phrases.items()
+        }
+        
+        self.body_text_pattern = re.compile('|'.join(f'(?:{p})' for p in body_patterns))
+        self.page_element_pattern = re.compile('|'.join(f'(?:{p})' for p in page_element_patterns))
     
     def normalize_text(self, text: str) -> str:
         """
@@ -91,12 +318,10 @@ class PDFOutlineExtractor:
         # This preserves characters like \u2019 (right single quotation mark)
         
         # Fix common PDF extraction issues - remove excessive character repetitions
-        # This addresses issues like "RRRRequest" -> "Request"
-        text = re.sub(r'(.)\1{2,}', r'\1', text)
-        
-        # Fix broken words that are split with repeated characters
-        # Pattern like "oooor" -> "or", "eeee" -> "e" but preserve meaningful repetitions
-        text = re.sub(r'\b(\w)\1{3,}\b', r'\1', text)
+        # This addresses issues like "RRRRequest" -> "Request". Since every run of
+        # 3+ repeats collapses here, broken words like "oooor" are fixed too and
+        # no separate 4+ repeat pass is needed.
+        text = self.repeated_char_pattern.sub(r'\1', text)
         
         # Do NOT fix UTF-8 encoding - keep original characters for proper JSON encoding
         # Comment out these lines to preserve \u2019 etc.:
@@ -107,16 +332,12 @@ class PDFOutlineExtractor:
         # text = text.replace('â€"', '—')  # Em dash
         
         # Preserve tabs, newlines, and other whitespace as literal characters
-        # Only normalize excessive spaces within the same line
-        lines = text.split('\n')
-        normalized_lines = []
+        # Only normalize excessive spaces (a space run never crosses a newline,
+        # so no per-line split is needed); most spans have none to fix
+        if '  ' in text:
+            text = self.multi_space_pattern.sub(' ', text)
         
-        for line in lines:
-            # Replace multiple spaces with single space but preserve other whitespace
-            line = re.sub(r' +', ' ', line)
-            normalized_lines.append(line)
-        
-        return '\n'.join(normalized_lines)
+        return text
     
     def extract_outline(self, pdf_path: str) -> Dict[str, Any]:
         """
@@ -129,20 +350,18 @@ class PDFOutlineExtractor:
             Dictionary containing title and outline structure
         """
         try:
-            doc = fitz.open(pdf_path)
-            self.logger.info(f"Processing PDF: {pdf_path} ({doc.page_count} pages)")
-            
-            # Extract text spans from all pages
+            # Extract text spans from all pages; the context manager closes the
+            # document even if extraction raises
             all_spans = []
             page_avg_sizes = []
             
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_spans, avg_size = self._extract_page_spans(page, page_num)
-                all_spans.extend(page_spans)
-                page_avg_sizes.append(avg_size)
-            
-            doc.close()
+            with fitz.open(pdf_path) as doc:
+                self.logger.debug("Processing PDF: %s (%d pages)", pdf_path, doc.page_count)
+                
+                for page_num, page in enumerate(doc):
+                    page_spans, avg_size = self._extract_page_spans(page, page_num)
+                    all_spans.extend(page_spans)
+                    page_avg_sizes.append(avg_size)
             
             # Analyze layout and classify headings
             title = self._extract_title(all_spans)
@@ -179,7 +398,7 @@ class PDFOutlineExtractor:
             }
             
         except Exception as e:
-            self.logger.error(f"Error processing PDF {pdf_path}: {str(e)}")
+            self.logger.error("Error processing PDF %s: %s", pdf_path, e)
             return {"title": "", "outline": []}
     
     def _adjust_page_numbers(self, spans: List[Dict]) -> List[Dict]:
@@ -194,8 +413,11 @@ class PDFOutlineExtractor:
         max_page = max(span["page"] for span in spans)
         # Note: Don't return early for single-page documents, let them go through adjustment logic
             
+        # Lowercase each span once; reused by the type check and both content passes
+        texts_lower = [s["text"].lower() for s in spans]
+        
         # Detect document type to determine page numbering strategy
-        all_text = ' '.join([s["text"].lower() for s in spans])
+        all_text = ' '.join(texts_lower)
         
         # Determine page numbering offset based on document characteristics
         if 'foundation level' in all_text and 'extension' in all_text:
@@ -223,21 +445,22 @@ class PDFOutlineExtractor:
         ]
         
         first_content_page = None
+        first_indicator_page = None
         
-        # First pass: look for specific heading-style indicators
-        for span in spans:
-            text_lower = span["text"].lower().strip()
-            if text_lower in ['revision history', 'table of contents', 'acknowledgements', 'summary', 'background']:
+        # Single pass: stop at the first specific heading-style indicator, and
+        # remember the first span with any content indicator as the fallback
+        for span, text_lower in zip(spans, texts_lower):
+            text_lower = text_lower.strip()
+            if text_lower in {'revision history', 'table of contents', 'acknowledgements', 'summary', 'background'}:
                 first_content_page = span["page"]
                 break
+            if (first_indicator_page is None and
+                    any(indicator in text_lower for indicator in content_indicators)):
+                first_indicator_page = span["page"]
         
-        # If not found, second pass: look for any content indicators
+        # If not found, fall back to the first span with any content indicator
         if first_content_page is None:
-            for span in spans:
-                text_lower = span["text"].lower().strip()
-                if any(indicator in text_lower for indicator in content_indicators):
-                    first_content_page = span["page"]
-                    break
+            first_content_page = first_indicator_page
         
         # Apply page number adjustment
         adjusted_spans = []
@@ -266,7 +489,9 @@ class PDFOutlineExtractor:
         font_sizes = []
         
         try:
-            blocks = page.get_text("dict")["blocks"]
+            # Default dict flags minus TEXT_PRESERVE_IMAGES: image blocks (and
+            # their embedded image bytes) are never used, so MuPDF skips them
+            blocks = page.get_text("dict", flags=fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES)["blocks"]
             
             for block in blocks:
                 if "lines" not in block:
@@ -275,32 +500,36 @@ class PDFOutlineExtractor:
                 for line in block["lines"]:
                     for span in line["spans"]:
                         text = span["text"]
-                        if not text or not text.strip():
+                        # isspace() tests in C without allocating a stripped copy
+                        if not text or text.isspace():
                             continue
                             
                         # Preserve original text including tabs, newlines, control chars
                         # but normalize for better processing
                         normalized_text = self.normalize_text(text)
                         
+                        # Unpack the bbox once instead of indexing it six times
+                        x0, y0, x1, y1 = span["bbox"]
+                        size = span["size"]
+                        
+                        # Keep only the fields the pipeline reads
                         span_data = {
                             "text": normalized_text,
-                            "original_text": text,
-                            "font_size": span["size"],
-                            "font": span["font"],
+                            "font_size": size,
+                            "font": sys.intern(span["font"]),  # few distinct names per document
                             "flags": span["flags"],
-                            "x": span["bbox"][0],
-                            "y": span["bbox"][1],
-                            "width": span["bbox"][2] - span["bbox"][0],
-                            "height": span["bbox"][3] - span["bbox"][1],
-                            "page": page_num,  # Use actual physical page numbers for now
-                            "bbox": span["bbox"]
+                            "x": x0,
+                            "y": y0,
+                            "width": x1 - x0,
+                            "height": y1 - y0,
+                            "page": page_num  # Use actual physical page numbers for now
                         }
                         
                         spans.append(span_data)
-                        font_sizes.append(span["size"])
+                        font_sizes.append(size)
                         
         except Exception as e:
-            self.logger.warning(f"Error extracting spans from page {page_num}: {str(e)}")
+            self.logger.warning("Error extracting spans from page %d: %s", page_num, e)
         
         # Calculate average font size for the page
         avg_size = statistics.median(font_sizes) if font_sizes else 12.0
@@ -315,62 +544,77 @@ class PDFOutlineExtractor:
         if not spans:
             return ""
             
-        # Get spans from first physical page (page 0 before adjustment)
-        first_page_spans = [s for s in spans if s["page"] == 0]
+        # Get spans from first physical page (page 0 before adjustment).
+        # Spans arrive in page order, so stop at the first span past page 0.
+        first_page_spans = list(takewhile(lambda s: s["page"] == 0, spans))
         if not first_page_spans:
             return ""
         
-        # Calculate page dimensions
-        page_width = max((s["x"] + s["width"]) for s in first_page_spans) if first_page_spans else 1
-        page_height = max(s["y"] + s["height"] for s in first_page_spans) if first_page_spans else 1
+        # Calculate page dimensions and the largest font size in a single pass
+        page_width = page_height = max_font_size = 0.0
+        for s in first_page_spans:
+            right = s["x"] + s["width"]
+            bottom = s["y"] + s["height"]
+            if right > page_width:
+                page_width = right
+            if bottom > page_height:
+                page_height = bottom
+            if s["font_size"] > max_font_size:
+                max_font_size = s["font_size"]
         
         # Special check: for invitation/flyer documents, no title
         # More specific pattern: need multiple invitation indicators
-        all_text = ' '.join([s["text"] for s in first_page_spans]).lower()
-        invitation_indicators = [
-            'hope to see', 'pigeon forge', 'rsvp', 'party', 
-            'invitation', 'please visit', 'waiver', 'topjump'
-        ]
-        invitation_count = sum(1 for phrase in invitation_indicators if phrase in all_text)
+        all_text = ' '.join([s["text"] for s in first_page_spans])
+        invitation_matches = {m.group(0).lower() for m in self.invitation_pattern.finditer(all_text)}
         # Only filter if multiple invitation indicators OR specific strong indicators
-        if (invitation_count >= 2 or 
-            any(strong_phrase in all_text for strong_phrase in ['rsvp', 'invitation', 'topjump'])):
+        if (len(invitation_matches) >= 2 or 
+            not invitation_matches.isdisjoint(['rsvp', 'invitation', 'topjump'])):
             return ""  # No title for invitations/flyers
         
         # Strategy 1: Look for consecutive large font text in upper portion (expanded to 50%)
         upper_spans = [s for s in first_page_spans if s["y"] < page_height * 0.5]  # Top 50%
         
         if upper_spans:
-            # Find spans with largest font size across the page
-            all_font_sizes = [s["font_size"] for s in first_page_spans]
-            max_font_size = max(all_font_sizes) if all_font_sizes else 12.0
-            largest_spans = [s for s in upper_spans if s["font_size"] >= max_font_size * 0.95]
+            # Find spans with largest font size across the page, and in the same
+            # pass the medium-large ones (like size 24) used for RFP titles
+            largest_threshold = max_font_size * 0.95
+            medium_threshold = max_font_size * 0.7
+            largest_spans = []
+            medium_large_spans = []
+            for s in upper_spans:
+                if s["font_size"] >= largest_threshold:
+                    largest_spans.append(s)
+                elif s["font_size"] >= medium_threshold:
+                    medium_large_spans.append(s)
             
             # Special handling for RFP documents - include medium-sized clean text
             is_rfp_doc = any('rfp' in s["text"].lower() for s in first_page_spans)
             if is_rfp_doc:
-                # Also include spans that are medium-large (like size 24) for clean parts
-                medium_large_spans = [s for s in upper_spans if s["font_size"] >= max_font_size * 0.7]
                 # Combine largest and medium-large spans for RFP
-                title_candidate_spans = largest_spans + [s for s in medium_large_spans if s not in largest_spans]
+                title_candidate_spans = largest_spans + medium_large_spans
             else:
                 title_candidate_spans = largest_spans
             
             # Group consecutive large font spans that might form the title
+            # (sorted once in reading order, reused when joining the parts)
+            ordered_candidates = sorted(title_candidate_spans, key=itemgetter("y", "x"))
             title_parts = []
-            for span in sorted(title_candidate_spans, key=lambda x: (x["y"], x["x"])):
+            for span in ordered_candidates:
                 text = span["text"].strip()
                 if text and len(text) >= 3 and not self._is_form_field(text):
                     # Skip version numbers and organization names for title
-                    if not any(skip in text.lower() for skip in ['version', 'international', 'board', 'copyright']):
+                    text_lower = text.lower()
+                    if not any(skip in text_lower for skip in ['version', 'international', 'board', 'copyright']):
                         title_parts.append(text)
             
+            title_parts_lower = ' '.join(title_parts).lower()
+            
             # Special case: if this looks like an invitation/flyer with large decorative text, no title
-            if title_parts and any(word in ' '.join(title_parts).lower() for word in ['hope', 'see', 'there']):
+            if title_parts and any(word in title_parts_lower for word in ['hope', 'see', 'there']):
                 return ""  # No title for invitations/flyers
             
             # Special case: if title parts look like addresses, no title for invitations
-            if title_parts and any(word in ' '.join(title_parts).lower() for word in ['pigeon forge', 'tn', 'address']):
+            if title_parts and any(word in title_parts_lower for word in ['pigeon forge', 'tn', 'address']):
                 return ""  # No title for location-based invitations
             
             # If we have multiple title parts, combine them
@@ -384,8 +628,8 @@ class PDFOutlineExtractor:
                 else:
                     # For multiple parts, use original spacing between spans
                     # Find the original spans and preserve their exact text and spacing
-                    sorted_spans = sorted([s for s in title_candidate_spans if s["text"].strip() in title_parts], 
-                                        key=lambda x: (x["y"], x["x"]))
+                    title_part_set = set(title_parts)
+                    sorted_spans = [s for s in ordered_candidates if s["text"].strip() in title_part_set]
                     combined_title = "".join([s["text"] for s in sorted_spans])
                     
                     # Clean up corrupted text for RFP documents
@@ -395,9 +639,7 @@ class PDFOutlineExtractor:
                     return combined_title
         
         # Strategy 2: Look for text that spans significant width in upper half
-        upper_half_spans = [s for s in first_page_spans if s["y"] < page_height * 0.5]
-        
-        for span in sorted(upper_half_spans, key=lambda x: x["font_size"], reverse=True):
+        for span in sorted(upper_spans, key=lambda x: x["font_size"], reverse=True):
             line_coverage = span["width"] / page_width if page_width > 0 else 0
             text_length = len(span["text"].strip())
             
@@ -406,7 +648,7 @@ class PDFOutlineExtractor:
                 return span["text"].strip()
         
         # Strategy 3: First substantial text that looks like a title
-        for span in sorted(first_page_spans, key=lambda x: (x["y"], x["x"])):
+        for span in sorted(first_page_spans, key=itemgetter("y", "x")):
             text = span["text"].strip()
             if (len(text) >= 10 and len(text) <= 150 and
                 not self._is_form_field(text) and
@@ -478,55 +720,7 @@ class PDFOutlineExtractor:
     
     def _is_form_field(self, text: str) -> bool:
         """Check if text looks like a form field label."""
-        text = text.strip().lower()
-        
-        # Very short text (likely form numbers or labels)
-        if len(text) <= 3 and text.isdigit():
-            return True
-        
-        if len(text) <= 5 and (text.endswith('.') or text.isdigit()):
-            return True
-        
-        # Common form field patterns
-        form_indicators = [
-            'name', 'designation', 'date', 'service', 'pay', 'whether',
-            'home town', 'employed', 'signature', 'place', 'stamp',
-            'office', 'department', 'employee', 'id', 'number', 's.no',
-            'serial', 'amount', 'rupees', 'advance', 'purpose', 'from',
-            'to', 'duration', 'period', 'remarks', 'recommendation',
-            'approved', 'sanctioned', 'certified', 'checked'
-        ]
-        
-        # Check for exact matches or containing form indicators
-        if text in form_indicators:
-            return True
-            
-        # Check if text contains form indicators (but not decorative text or actual titles)
-        for indicator in form_indicators:
-            # More strict matching - avoid false positives with decorative text and document titles
-            if (indicator in text and 
-                len(text) <= 30 and  # Shorter text more likely to be form fields
-                not any(deco in text for deco in ['hope', 'see', 'you', 'there', 'welcome', 'party', 'event']) and
-                not any(title_pattern in text for title_pattern in ['application form', 'request form', 'form for'])):
-                return True
-        
-        # Form field patterns
-        form_patterns = [
-            r'^s\.?\s*no\.?$',  # S.No, S No, etc.
-            r'^\d+\.?$',  # Just numbers
-            r'^[a-z]\)$',  # a), b), c)
-            r'^\([a-z]\)$',  # (a), (b), (c)
-            r'^rs\.?\s*\d*$',  # Rs. or Rs
-            r'^\$\s*\d*$',  # $ amounts
-            r'^date\s*:',  # Date:
-            r'^time\s*:',  # Time:
-        ]
-        
-        for pattern in form_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return True
-                
-        return False
+        return _is_form_field_text(text)
     
     def _looks_like_title(self, text: str) -> bool:
         """Check if text looks like a document title."""
@@ -539,26 +733,8 @@ class PDFOutlineExtractor:
         # Contains form field indicators
         if self._is_form_field(text):
             return False
-            
-        # Looks like a sentence or paragraph
-        if text.count('.') > 2 or text.count(',') > 3:
-            return False
-            
-        # Good title indicators
-        title_words = ['application', 'form', 'report', 'guide', 'manual', 
-                      'overview', 'introduction', 'plan', 'proposal', 'request']
         
-        if any(word in text.lower() for word in title_words):
-            return True
-            
-        # Title case or ALL CAPS
-        words = text.split()
-        if len(words) >= 2:
-            title_case_count = sum(1 for word in words if word and word[0].isupper())
-            if title_case_count / len(words) >= 0.5:
-                return True
-                
-        return False
+        return _has_title_shape(text)
     
     def _group_spans_by_line(self, spans: List[Dict]) -> List[Dict]:
         """
@@ -569,7 +745,7 @@ class PDFOutlineExtractor:
             return []
         
         # Sort spans by page, then by y-coordinate, then by x-coordinate
-        sorted_spans = sorted(spans, key=lambda s: (s["page"], s["y"], s["x"]))
+        sorted_spans = sorted(spans, key=itemgetter("page", "y", "x"))
         
         grouped_spans = []
         current_group = []
@@ -621,11 +797,11 @@ class PDFOutlineExtractor:
         # Sort spans by x-coordinate to maintain reading order
         spans = sorted(spans, key=lambda s: s["x"])
         
-        # Combine text with proper spacing
-        combined_text = ""
+        # Combine text with proper spacing (collect parts, join once)
+        text_parts = []
         last_x_end = None
         
-        for i, span in enumerate(spans):
+        for span in spans:
             span_text = span["text"]
             
             # Add space between spans if there's a gap
@@ -634,15 +810,15 @@ class PDFOutlineExtractor:
                 if gap > 1:  # Very small gap tolerance
                     # Add spacing based on gap size and content
                     if gap > 8 or (gap > 3 and not span_text.islower()):
-                        combined_text += " "  # Normal word spacing
+                        text_parts.append(" ")  # Normal word spacing
                     # Very small gaps get no spacing for touching letters
             
-            combined_text += span_text
+            text_parts.append(span_text)
             last_x_end = span["x"] + span["width"]
         
         # Create combined span with properties from first span
         combined_span = spans[0].copy()
-        combined_span["text"] = combined_text.strip()  # Remove any extra spaces
+        combined_span["text"] = "".join(text_parts).strip()  # Remove any extra spaces
         combined_span["width"] = last_x_end - spans[0]["x"]
         
         return combined_span
@@ -664,7 +840,7 @@ class PDFOutlineExtractor:
         if title.strip():
             title_clean = title.strip()
             # For complex titles (like RFP), filter out individual components that make up the title
-            title_parts = []
+            title_parts = set()
             
             # Split title into meaningful parts for filtering
             if 'RFP' in title_clean and len(title_clean) > 50:
@@ -683,7 +859,7 @@ class PDFOutlineExtractor:
                         # But keep spans that are clearly section headings (even if they contain these words)
                         if not (text.endswith(':') or text.startswith('1.') or text.startswith('2.') or 
                                'Summary' in text or 'Background' in text or 'Timeline' in text):
-                            title_parts.append(text)
+                            title_parts.add(text)
             
             # Filter out exact title match and identified title parts
             filtered_spans = []
@@ -780,6 +956,14 @@ class PDFOutlineExtractor:
             
             i += 1
         
+        # Specific problematic timeline entries in file03 to skip
+        problematic_timelines = {
+            "Timeline: March 2003 – September 2003",
+            "Timeline: April 2004 – December 2006", 
+            "Timeline: January 2007 -",
+            "Phase I: Operating and Growing the ODL"  # Only filter Phase I, allow Phase II and III
+        }
+        
         # Filter out obvious non-headings first
         potential_headings = []
         for span in sorted_spans:
@@ -799,14 +983,7 @@ class PDFOutlineExtractor:
             if re.match(r'.+\.\s\d+$', text):
                 continue
             
-            # Skip specific problematic timeline entries in file03 
-            problematic_timelines = [
-                "Timeline: March 2003 – September 2003",
-                "Timeline: April 2004 – December 2006", 
-                "Timeline: January 2007 -",
-                "Phase I: Operating and Growing the ODL"  # Only filter Phase I, allow Phase II and III
-            ]
-            if text.strip() in problematic_timelines:
+            if text in problematic_timelines:
                 continue
                 
             # Skip very long text (likely paragraphs)
@@ -939,49 +1116,23 @@ class PDFOutlineExtractor:
         # H1 patterns for RFP (large headings on main content pages)
         size = span.get("size", span.get("font_size", 12))  # Handle both field names
         if size >= 15.5:  # Lowered threshold to catch 15.96 font size
-            rfp_h1_keywords = [
-                "ontario", "digital library", "critical component", 
-                "road map", "prosperity", "implementing"
-            ]
-            for keyword in rfp_h1_keywords:
-                if keyword in text_lower:
-                    span['suggested_level'] = 'H1'
-                    return True
-                    return True
+            if self.rfp_h1_pattern.search(text_lower):
+                span['suggested_level'] = 'H1'
+                return True
         
         # H2 patterns for RFP (medium headings - section titles)
         if size >= 12 and size < 16:
-            rfp_h2_keywords = [
-                'summary', 'background', 'methodology', 'deliverables', 
-                'timeline', 'budget', 'evaluation', 'conclusion',
-                'business plan', 'approach', 'awarding', 'contract',
-                'appendix a:', 'appendix b:', 'appendix c:', 'steering committee', 
-                'terms of reference', 'electronic resources', 'envisioned phases',
-                'funding'
-            ]
-            
             # Check for exact appendix patterns
             if re.match(r'^appendix [abc]:', text_lower):
                 span['suggested_level'] = 'H2'
                 return True
             
-            if any(keyword in text_lower for keyword in rfp_h2_keywords) and len(text.split()) <= 8:
+            if self.rfp_h2_pattern.search(text_lower) and len(text.split()) <= 8:
                 span['suggested_level'] = 'H2'
                 return True
         
         # H3 patterns for RFP (smaller headings, often with colons or numbered)
         if size >= 11:
-            rfp_h3_keywords = [
-                'timeline', 'access', 'governance', 'funding', 'decision-making',
-                'accountability', 'structure', 'equitable', 'shared', 'local',
-                'guidance', 'advice', 'training', 'purchasing', 'licensing', 
-                'technological', 'support', 'milestones', 'business planning', 
-                'implementing', 'transitioning', 'operating', 'growing', 'preamble', 
-                'membership', 'appointment', 'criteria', 'process', 'term', 'chair', 
-                'meetings', 'lines', 'communication', 'financial', 'administrative', 
-                'policies', 'phase', 'what could', 'really mean'
-            ]
-            
             # Force detection of critical missing headings regardless of other criteria
             critical_h3_patterns = [
                 'guidance and advice',
@@ -992,7 +1143,7 @@ class PDFOutlineExtractor:
                 return True
             
             # Check for colon endings (common in RFP H3)
-            if text.endswith(':') and (any(keyword in text_lower for keyword in rfp_h3_keywords) or 
+            if text.endswith(':') and (self.rfp_h3_pattern.search(text_lower) or 
                                        len(text.split()) <= 4):
                 span['suggested_level'] = 'H3'
                 return True
@@ -1000,7 +1151,7 @@ class PDFOutlineExtractor:
             # Check for numbered sections ONLY in appendix pages (page >= 10) 
             page_num = span.get("page", 0)
             if (re.match(r'^\d+\.\s+', text) and page_num >= 10 and
-                any(keyword in text_lower for keyword in rfp_h3_keywords)):
+                self.rfp_h3_pattern.search(text_lower)):
                 span['suggested_level'] = 'H3'
                 return True
             
@@ -1175,51 +1326,17 @@ class PDFOutlineExtractor:
     
     def _should_skip_span(self, text: str) -> bool:
         """Check if span should be skipped as obvious non-heading."""
-        text_lower = text.lower()
-        
-        # Don't skip specific target headings
-        target_headings = ['revision history', 'table of contents', 'acknowledgements', 'references', 'pathway options']
-        if any(target in text_lower for target in target_headings):
-            return False
-        
-        # Don't skip critical file03 headings - be flexible with Phase III pattern
-        critical_file03_headings = ['guidance and advice', 'milestones', 'phase iii']
-        if any(critical in text_lower for critical in critical_file03_headings):
-            return False
-        
-        # Skip headers/footers that appear on multiple pages
-        if any(skip in text_lower for skip in [
-            'overview', 'software testing', 'qualifications board', 
-            'foundation level extension', 'copyright', '©', 'international',
-            'version 1.0', 'agile tester'
-        ]) and len(text.split()) <= 6:
-            return True
-        
-        # Skip table of contents entries (with many dots and page numbers)
-        if text.count('.') > 20:  # TOC entries have tons of dots
-            return True
-        
-        # Skip table of contents entries with pattern "Text . Number" (e.g., "Revision History . 3")
-        if re.match(r'.+\s\.\s\d+$', text):
-            return True
-        
-        # Skip table of contents entries with pattern "Text. Number" (e.g., "2.5 Structure and Course Duration. 8")
-        if re.match(r'.+\.\s\d+$', text):
-            return True
-        
-        # Skip author names and long descriptive text
-        if len(text) > 100:
-            return True
+        verdict = _skip_span_verdict(text)
+        if verdict is not None:
+            return verdict
         
         # Skip obvious form fields
-        if self._is_form_field(text):
-            return True
-        
-        return False
+        return self._is_form_field(text)
     
     def _is_potential_heading(self, span: Dict, doc_type: str) -> bool:
         """Check if a span could be a heading based on content and formatting."""
         text = span["text"].strip()
+        text_lower = text.lower()
         
         # Skip very short or very long text
         if len(text) < 3 or len(text) > 200:
@@ -1241,7 +1358,7 @@ class PDFOutlineExtractor:
             re.match(r'^\d+\.\d+\.\d+\.?\s+[A-Z]', text),  # "2.1.1 Subsection"
             
             # Structural keywords
-            any(keyword in text.lower() for keyword in [
+            any(keyword in text_lower for keyword in [
                 'introduction', 'overview', 'summary', 'conclusion', 'background',
                 'table of contents', 'acknowledgements', 'references', 'appendix',
                 'revision history', 'pathway options', 'goals', 'mission'
@@ -1419,13 +1536,13 @@ class PDFOutlineExtractor:
                     'testers who', 'individuals who'
                 ]
                 
-                is_list_item = any(indicator in text.lower() for indicator in list_indicators)
+                is_list_item = any(indicator in text_lower for indicator in list_indicators)
                 
                 # Only add if it's not a list item and is substantial heading text
                 if not is_list_item and len(text.split()) >= 3:
                     # Look for key heading words that indicate real sections
                     heading_words = ['introduction', 'overview', 'references', 'background', 'summary']
-                    has_heading_word = any(word in text.lower() for word in heading_words)
+                    has_heading_word = any(word in text_lower for word in heading_words)
                     
                     if has_heading_word or len(text.split()) <= 10:  # Short headings or those with heading words
                         candidates.append({
@@ -1602,18 +1719,16 @@ class PDFOutlineExtractor:
         result = []
         seen = set()
         
-        for heading in headings:
-            text = heading['text']
-            page = heading['page']  # Use direct page access
-            level = heading['level']
-            
+        # Fetch all three fields per heading in one C-level call
+        for level, text, page in map(itemgetter('level', 'text', 'page'), headings):
             # Preserve exact text including trailing spaces if they exist in original
             # Just ensure we don't have leading spaces
             clean_text = text.lstrip()
+            stripped = clean_text.rstrip()
             
             # Avoid duplicates
-            key = (clean_text.lower().strip(), page)
-            if key not in seen and len(clean_text.strip()) >= 3:
+            key = (stripped.lower(), page)
+            if key not in seen and len(stripped) >= 3:
                 seen.add(key)
                 result.append({
                     "level": level,
@@ -1622,7 +1737,7 @@ class PDFOutlineExtractor:
                 })
         
         # Sort by page and position
-        result.sort(key=lambda x: x["page"])
+        result.sort(key=itemgetter("page"))
         
         return result
     
@@ -1686,7 +1801,8 @@ class PDFOutlineExtractor:
             text = span["text"]  # Don't strip to preserve exact spacing
             
             # Look for specific invitation patterns (case insensitive check but preserve original case)
-            if any(word in text.lower() for word in ['hope', 'see', 'there']):
+            text_lower = text.lower()
+            if any(word in text_lower for word in ['hope', 'see', 'there']):
                 if len(text.strip()) >= 10:  # Substantial text when trimmed
                     # Normalize spacing - replace multiple spaces with single space
                     normalized_text = ' '.join(text.split())
@@ -1700,9 +1816,8 @@ class PDFOutlineExtractor:
         
         # Return only the best candidate
         if candidates:
-            # Sort by length to get the main heading
-            candidates.sort(key=lambda x: len(x['text'].strip()), reverse=True)
-            return [candidates[0]]  # Only return the main heading
+            # Longest text is the main heading; no need to sort the rest
+            return [max(candidates, key=lambda x: len(x['text'].strip()))]
         
         return []
     
@@ -1716,11 +1831,36 @@ class PDFOutlineExtractor:
         
         # Analyze first several spans to get document context
         analysis_spans = spans[:100] if len(spans) > 100 else spans
-        all_text = ' '.join([s["text"] for s in analysis_spans]).lower()
         
         # Also check ALL spans for invitation patterns (since they might be at the end)
         full_text = ' '.join([s["text"] for s in spans]).lower()
         
+        # Invitation and religious patterns take precedence over every per-span
+        # indicator, so decide them first and skip the span scan when they hit
+        if any(phrase in full_text for phrase in [
+            'hope to see', 'rsvp', 'party', 'invitation', 'topjump'
+        ]):
+            return 'invitation'
+        
+        # Check for religious/devotional document patterns
+        religious_indicators = [
+            'बजरंग', 'हनुमान', 'राम', 'सीता', '॥', 'दोहा', 'चौपाई', 
+            'भजन', 'आरती', 'मंत्र', 'श्लोक', 'स्तोत्र', 'प्रभु', 'जय'
+        ]
+        religious_count = sum(1 for indicator in religious_indicators if indicator in full_text)
+        if religious_count >= 3:  # If multiple religious indicators found
+            return 'religious'
+        
+        # Short documents are analysed in full, so reuse the same lowercased text
+        if analysis_spans is spans:
+            all_text = full_text
+        else:
+            all_text = ' '.join([s["text"] for s in analysis_spans]).lower()
+        
+        patterns = self.doc_type_patterns
+        # General form words don't count in RFP contexts
+        rfp_context = 'rfp' in all_text or 'proposal' in all_text
+        
         for span in analysis_spans:
             text = span["text"].strip().lower()
             if len(text) < 3:
@@ -1728,55 +1868,27 @@ class PDFOutlineExtractor:
             total_text += 1
             
             # RFP/Proposal indicators (check first!)
-            if any(phrase in text for phrase in [
-                'rfp:', 'request for proposal', 'proposal for developing',
-                'business plan', 'ontario digital library', 'steering committee',
-                'timeline:', 'background', 'summary'
-            ]):
+            if patterns['rfp'].search(text):
                 rfp_indicators += 3
             
             # Strong form indicators (application forms, employee forms)
-            elif any(phrase in text for phrase in [
-                'application form for', 'employee code', 'employee name:',
-                'ltc advance', 'grant of advance', 'signature of employee',
-                'forwarded for approval', 'office seal'
-            ]):
+            elif patterns['strong_form'].search(text):
                 form_indicators += 3
             
             # General form indicators (but exclude RFP contexts)
-            elif (any(word in text for word in ['application', 'form', 'name:', 'date:', 'signature']) and
-                  'rfp' not in all_text and 'proposal' not in all_text):
+            elif not rfp_context and patterns['form'].search(text):
                 form_indicators += 1
             
             # Structured document indicators  
-            elif any(word in text for word in [
-                'chapter', 'section', 'introduction', 'overview', 
-                'table of contents', 'acknowledgements', 'foundation level',
-                'revision history', 'copyright notice'
-            ]):
+            elif patterns['structured'].search(text):
                 structured_indicators += 2
             
             # Manual/book indicators
-            elif any(word in text for word in ['foundation', 'extensions', 'level']):
+            elif patterns['manual'].search(text):
                 manual_indicators += 1
         
-        # Classify based on strongest indicators (Check invitation patterns from full document first!)
-        invitation_found = any(phrase in full_text for phrase in [
-            'hope to see', 'rsvp', 'party', 'invitation', 'topjump'
-        ])
-        
-        # Check for religious/devotional document patterns
-        religious_indicators = [
-            'बजरंग', 'हनुमान', 'राम', 'सीता', '॥', 'दोहा', 'चौपाई', 
-            'भजन', 'आरती', 'मंत्र', 'श्लोक', 'स्तोत्र', 'प्रभु', 'जय'
-        ]
-        religious_count = sum(1 for indicator in religious_indicators if indicator in full_text)
-        
-        if invitation_found:
-            return 'invitation'
-        elif religious_count >= 3:  # If multiple religious indicators found
-            return 'religious'
-        elif rfp_indicators >= 3:
+        # Classify based on strongest indicators
+        if rfp_indicators >= 3:
             return 'rfp'
         elif form_indicators >= 3 and form_indicators > structured_indicators:
             return 'form'
@@ -1800,54 +1912,12 @@ class PDFOutlineExtractor:
             return True
         
         # Contains common body text patterns
-        body_patterns = [
-            r'hereby\s+request',
-            r'i\s+am\s+applying',
-            r'please\s+consider',
-            r'the\s+undersigned',
-            r'kindly\s+approve',
-            r'i\s+have\s+the\s+honor',
-            r'details\s+are\s+as\s+follows',
-            r'for\s+your\s+kind\s+consideration',
-            r'awaiting\s+your\s+response',
-            r'thank\s+you',
-            r'yours\s+faithfully',
-            r'yours\s+sincerely',
-            r'with\s+due\s+respect'
-        ]
-        
-        text_lower = text.lower()
-        for pattern in body_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        
-        return False
+        return self.body_text_pattern.search(text.lower()) is not None
     
     def _is_page_element(self, text: str) -> bool:
         """Check if text is a page element (header, footer, page number)."""
-        text = text.strip()
-        
-        # Page numbers
-        if re.match(r'^(page\s+)?\d+(\s+of\s+\d+)?$', text.lower()):
-            return True
-        
-        # Headers/footers
-        page_element_patterns = [
-            r'^\d{4}[-/]\d{2}[-/]\d{2}$',  # Dates
-            r'^page\s+\d+',
-            r'confidential',
-            r'internal\s+use',
-            r'draft',
-            r'©\s*\d{4}',
-            r'all\s+rights\s+reserved'
-        ]
-        
-        text_lower = text.lower()
-        for pattern in page_element_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        
-        return False
+        # Page numbers, headers and footers
+        return self.page_element_pattern.search(text.strip().lower()) is not None
     
     def _calculate_heading_score(self, span: Dict, size_ratio: float, font_75th: float, font_90th: float) -> float:
         """Calculate a score indicating how likely this span is to be a heading."""
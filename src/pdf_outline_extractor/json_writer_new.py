@@ -0,0 +1,62 @@
+"""
+JSON output module.
+Serializes extracted outlines as UTF-8 JSON (2-space indented or compact),
+using orjson when it is installed and the standard library otherwise.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+class JSONWriter:
+    """
+    Writes outline results to JSON files.
+
+    Non-ASCII characters are written as raw UTF-8 (never \\u-escaped). For
+    outline results (str keys, str and int values) the output is the same
+    whichever JSON backend is available; other payloads, e.g. floats, may
+    be formatted differently.
+    """
+
+    def __init__(self, pretty: bool = True):
+        """
+        Initialize the writer.
+
+        Args:
+            pretty: Indent output by 2 spaces (default); False writes compact JSON
+        """
+        self.pretty = pretty
+
+    def dumps(self, result: Dict[str, Any]) -> bytes:
+        """Serialize a result dictionary to UTF-8 encoded JSON bytes."""
+        if orjson is not None:
+            if self.pretty:
+                return orjson.dumps(result, option=orjson.OPT_INDENT_2)
+            return orjson.dumps(result)
+        if self.pretty:
+            return json.dumps(result, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(result, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def write(self, result: Dict[str, Any], output_path: Union[str, Path]) -> None:
+        """
+        Serialize a result dictionary and write it to output_path.
+
+        Writes go straight to the file descriptor, bypassing Python's buffered
+        io layer; outline payloads normally fit in a single write call.
+        """
+        data = memoryview(self.dumps(result))
+        # O_BINARY (Windows only) stops the fd from translating \n to \r\n
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(output_path, flags, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)